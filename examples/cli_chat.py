@@ -2,18 +2,33 @@ import asyncio
 import json
 import os
 from datetime import datetime
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 
 import httpx
 import typer
 from prompt_toolkit import PromptSession
 from prompt_toolkit.styles import Style
-from rich.console import Console
+from rich.console import Console, Group
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.live import Live
 from rich.text import Text
 
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Styling
 style = Style.from_dict({
     'prompt': '#00aa00 bold',
@@ -22,6 +37,117 @@ style = Style.from_dict({
 
 console = Console()
 
+# Live display refresh rate; rendering more often than this is wasted work
+REFRESH_PER_SECOND = 4
+RENDER_INTERVAL = 1 / REFRESH_PER_SECOND
+# Maximum content deltas buffered between the network reader and the renderer
+STREAM_QUEUE_SIZE = 256
+
+# SSE fast path: pull delta content straight out of the raw bytes
+_SSE_DATA_PREFIX = b'data: '
+_CONTENT_KEY = b'"content":'
+_JSON_ESCAPES = {
+    b'"': '"',
+    b'\\': '\\',
+    b'/': '/',
+    b'b': '\b',
+    b'f': '\f',
+    b'n': '\n',
+    b'r': '\r',
+    b't': '\t',
+}
+
+def extract_delta_content(line: bytes) -> Optional[str]:
+    """Extract the delta content string from an SSE data line without parsing the whole chunk.
+
+    Returns None when the line has no string content field, so callers can
+    fall back to a full JSON parse.
+    """
+    if not line.startswith(_SSE_DATA_PREFIX):
+        return None
+    key = line.find(_CONTENT_KEY)
+    if key == -1:
+        return None
+
+    pos = key + len(_CONTENT_KEY)
+    while line[pos:pos + 1] == b' ':
+        pos += 1
+    if line[pos:pos + 1] != b'"':
+        return None
+    pos += 1
+
+    parts = []
+    try:
+        while True:
+            quote = line.find(b'"', pos)
+            if quote == -1:
+                return None
+            backslash = line.find(b'\\', pos, quote)
+            if backslash == -1:
+                parts.append(line[pos:quote].decode('utf-8'))
+                return ''.join(parts)
+
+            parts.append(line[pos:backslash].decode('utf-8'))
+            escape = line[backslash + 1:backslash + 2]
+            if escape == b'u':
+                code = int(line[backslash + 2:backslash + 6], 16)
+                pos = backslash + 6
+                # Join UTF-16 surrogate pairs (json.dumps escapes non-ASCII by default)
+                if 0xD800 <= code < 0xDC00 and line[pos:pos + 2] == b'\\u':
+                    low = int(line[pos + 2:pos + 6], 16)
+                    if 0xDC00 <= low < 0xE000:
+                        code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                        pos += 6
+                parts.append(chr(code))
+            else:
+                char = _JSON_ESCAPES.get(escape)
+                if char is None:
+                    return None
+                parts.append(char)
+                pos = backslash + 2
+    except ValueError:
+        return None
+
+async def iter_sse_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a raw byte stream into SSE lines without decoding it."""
+    pending = b''
+    async for chunk in chunks:
+        if pending:
+            chunk = pending + chunk
+        lines = chunk.split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip(b'\r')
+    if pending:
+        yield pending.rstrip(b'\r')
+
+class StreamingMarkdown:
+    """Renderable that parses finished paragraphs once and shows the in-progress one as plain text."""
+
+    def __init__(self):
+        self.blocks: List[Markdown] = []
+        self.tail = ""
+
+    def append(self, text: str):
+        self.tail += text
+        search_from = 0
+        while True:
+            split = self.tail.find("\n\n", search_from)
+            if split == -1:
+                return
+            block = self.tail[:split]
+            # Never split inside an open code fence
+            if block.count("```") % 2 == 0:
+                if block.strip():
+                    self.blocks.append(Markdown(block))
+                self.tail = self.tail[split + 2:]
+                search_from = 0
+            else:
+                search_from = split + 2
+
+    def __rich__(self) -> Group:
+        return Group(*self.blocks, Text(self.tail))
+
 class ChatCLI:
     def __init__(self, api_url: str, model: str):
         self.api_url = api_url.rstrip('/')
@@ -34,7 +160,14 @@ class ChatCLI:
             style=style
         )
         self.messages: List[dict] = []
-        self.client = httpx.AsyncClient()
+        # Conversation transcript, written turn by turn
+        self.transcript_path: Optional[str] = None
+        self.transcript = None
+        # Keep the connection alive across chat turns
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=300),
+            timeout=httpx.Timeout(None, connect=10)
+        )
 
     async def get_user_input(self) -> Optional[str]:
         try:
@@ -46,55 +179,125 @@ class ChatCLI:
             return None
 
     async def stream_response(self, messages: List[dict]):
-        response = await self.client.post(
-            f"{self.api_url}/v1/chat/completions",
-            json={
-                "model": self.model,
-                "messages": messages,
-                "stream": True
-            },
-            timeout=None,
-            headers={"Accept": "text/event-stream"}
-        )
+        # Network reads and rendering run as separate tasks joined by a bounded queue,
+        # so a slow render never stalls draining the socket
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        producer = asyncio.create_task(self._read_stream(messages, queue))
+        try:
+            full_response = await self._render_stream(queue)
+        finally:
+            if not producer.done():
+                producer.cancel()
+        # Surface any network error from the reader
+        await producer
+        return full_response
 
-        full_response = ""
-        with Live(console=console, refresh_per_second=4) as live:
-            async for line in response.aiter_lines():
-                if line.startswith('data: '):
-                    data = line[6:]
-                    if data == '[DONE]':
-                        break
-                    try:
-                        chunk = json.loads(data)
-                        content = chunk['choices'][0]['delta'].get('content', '')
+    async def _read_stream(self, messages: List[dict], queue: asyncio.Queue):
+        """Read SSE content deltas from the API into the queue, ending with None."""
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{self.api_url}/v1/chat/completions",
+                json={
+                    "model": self.model,
+                    "messages": messages,
+                    "stream": True
+                },
+                timeout=None,
+                headers={"Accept": "text/event-stream"}
+            ) as response:
+                async for line in iter_sse_lines(response.aiter_bytes()):
+                    if line.startswith(_SSE_DATA_PREFIX):
+                        data = line[6:]
+                        if data == b'[DONE]':
+                            break
+                        content = extract_delta_content(line)
+                        if content is None:
+                            # Fall back to a full parse for non-delta events
+                            try:
+                                chunk = _loads(data)
+                                content = chunk['choices'][0]['delta'].get('content', '')
+                            except (json.JSONDecodeError, KeyError, IndexError):
+                                continue
                         if content:
-                            full_response += content
-                            live.update(Markdown(full_response))
-                    except json.JSONDecodeError:
-                        continue
+                            await queue.put(content)
+        finally:
+            await queue.put(None)
+
+    async def _render_stream(self, queue: asyncio.Queue) -> str:
+        """Render queued deltas, coalescing everything that arrived since the last refresh."""
+        parts: List[str] = []
+        view = StreamingMarkdown()
+        finished = False
+        with Live(console=console, refresh_per_second=REFRESH_PER_SECOND) as live:
+            while not finished:
+                batch = []
+                content = await queue.get()
+                while True:
+                    if content is None:
+                        finished = True
+                        break
+                    batch.append(content)
+                    if queue.empty():
+                        break
+                    content = queue.get_nowait()
+                
+                if batch:
+                    text = "".join(batch)
+                    parts.append(text)
+                    view.append(text)
+                    live.update(view)
+                if not finished:
+                    # Only re-render at the display rate, not once per token
+                    await asyncio.sleep(RENDER_INTERVAL)
+
+            full_response = "".join(parts)
+            # Single full Markdown parse once the response is complete
+            live.update(Markdown(full_response))
 
         return full_response
 
-    def save_conversation(self):
-        if not self.messages:
-            return
-        
-        # Create conversations directory if it doesn't exist
-        os.makedirs('conversations', exist_ok=True)
+    async def append_to_transcript(self, messages: List[dict]):
+        """Append messages to the transcript file, creating it on the first turn."""
+        text = "".join(f"## {msg['role'].title()}\n{msg['content']}\n\n" for msg in messages)
+        if self.transcript is None:
+            # Create conversations directory if it doesn't exist
+            os.makedirs('conversations', exist_ok=True)
+            
+            # Generate filename with timestamp
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            self.transcript_path = f'conversations/chat_{timestamp}.md'
+            if aiofiles is not None:
+                self.transcript = await aiofiles.open(self.transcript_path, 'w', encoding='utf-8')
+            else:
+                self.transcript = await asyncio.to_thread(open, self.transcript_path, 'w', encoding='utf-8')
+            text = f"# Conversation with {self.model}\n\n" + text
         
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'conversations/chat_{timestamp}.md'
+        if aiofiles is not None:
+            await self.transcript.write(text)
+            await self.transcript.flush()
+        else:
+            await asyncio.to_thread(self._write_sync, text)
+
+    def _write_sync(self, text: str):
+        self.transcript.write(text)
+        self.transcript.flush()
+
+    async def close_transcript(self, keep: bool):
+        """Close the transcript file, deleting it unless it should be kept."""
+        if self.transcript is None:
+            return
         
-        # Write conversation to file
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(f"# Conversation with {self.model}\n\n")
-            for msg in self.messages:
-                role = msg['role'].title()
-                content = msg['content']
-                f.write(f"## {role}\n{content}\n\n")
+        if aiofiles is not None:
+            await self.transcript.close()
+        else:
+            await asyncio.to_thread(self.transcript.close)
+        self.transcript = None
         
-        console.print(f"\n[green]Conversation saved to {filename}[/green]")
+        if keep:
+            console.print(f"\n[green]Conversation saved to {self.transcript_path}[/green]")
+        else:
+            os.remove(self.transcript_path)
 
     async def chat_loop(self):
         console.print(Panel(
@@ -122,6 +325,7 @@ class ChatCLI:
                     
                     # Add assistant response to history
                     self.messages.append({"role": "assistant", "content": assistant_response})
+                    await self.append_to_transcript(self.messages[-2:])
                     
                     console.print()  # Add a blank line for readability
                 
@@ -133,11 +337,10 @@ class ChatCLI:
             pass
         
         finally:
-            # Save conversation on exit
-            if self.messages:
+            # The transcript is already on disk; only decide whether to keep it
+            if self.transcript is not None:
                 save = typer.confirm("\nDo you want to save this conversation?")
-                if save:
-                    self.save_conversation()
+                await self.close_transcript(keep=save)
             
             await self.client.aclose()
 
@@ -155,6 +358,8 @@ def main(
         chat = ChatCLI(api_url, model)
         await chat.chat_loop()
 
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(run())
 
 if __name__ == "__main__":
@@ -1,18 +1,86 @@
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 import logging
-from typing import Tuple, List, Dict, AsyncGenerator
+from typing import Tuple, List, Dict, AsyncGenerator, Optional
 import asyncio
+import json
 import time
-from models import CLAUDE_MODELS, CHATGPT_MODELS, ModelProvider
-from cache import ConversationCache
+import uuid
+from itertools import islice
+from models import CLAUDE_MODELS, CHATGPT_MODELS, MODEL_REGISTRY, ModelProvider
+from cache import ConversationCache, ResponseCache
 from google_auth import GoogleAuth
 
 logger = logging.getLogger(__name__)
 
+# Chat URLs with this prefix are served from the response cache, not a web page
+CACHED_RESPONSE_SCHEME = "cache://"
+
+# Debug screenshots: at most SCREENSHOT_LIMIT per SCREENSHOT_WINDOW seconds,
+# with no more than SCREENSHOT_CONCURRENCY in flight
+SCREENSHOT_LIMIT = 10
+SCREENSHOT_WINDOW = 60
+SCREENSHOT_CONCURRENCY = 4
+
+# Seconds without a streamed delta before a response is considered finished
+STREAM_IDLE_TIMEOUT = 5
+
+# True once at least `count` elements match a selector
+MIN_ELEMENT_COUNT_SCRIPT = "([selector, count]) => document.querySelectorAll(selector).length >= count"
+
+# Text of the last element matching a selector, resolved inside the page
+LATEST_RESPONSE_TEXT_SCRIPT = """
+(selector) => {
+    const nodes = document.querySelectorAll(selector);
+    return nodes.length ? nodes[nodes.length - 1].textContent : "";
+}
+"""
+
+# Injected into every page: watches the latest response node and pushes only
+# the appended text back to Python through the onStreamDelta binding. Each arming
+# gets a new id, sent with every delta, so late deltas from an earlier watch can be told apart.
+STREAM_OBSERVER_SCRIPT = """
+window.__aipiWatchResponse = (responseSelector, doneSelector) => {
+    if (window.__aipiObserver) {
+        window.__aipiObserver.disconnect();
+    }
+    const watchId = window.__aipiWatchId = (window.__aipiWatchId || 0) + 1;
+    const baseline = document.querySelectorAll(responseSelector).length;
+    const doneBaseline = document.querySelectorAll(doneSelector).length;
+    // Only a node and a length are tracked; the text itself is never retained
+    let lastNode = null;
+    let lastLen = 0;
+    const observer = new MutationObserver(() => {
+        const nodes = document.querySelectorAll(responseSelector);
+        if (nodes.length > baseline) {
+            const node = nodes[nodes.length - 1];
+            if (node !== lastNode) {
+                lastNode = node;
+                lastLen = 0;
+            }
+            const text = node.textContent;
+            if (text.length > lastLen) {
+                window.onStreamDelta(watchId, text.slice(lastLen));
+                lastLen = text.length;
+            }
+        }
+        if (document.querySelectorAll(doneSelector).length > doneBaseline) {
+            observer.disconnect();
+            window.__aipiObserver = null;
+            window.onStreamDelta(watchId, null);
+        }
+    });
+    observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+    window.__aipiObserver = observer;
+    return watchId;
+};
+"""
+
 class LLMWebBridge:
-   def __init__(self, config: dict, cache: ConversationCache):
+   def __init__(self, config: dict, cache: ConversationCache,
+                response_cache: Optional[ResponseCache] = None):
        self.config = config
        self.cache = cache
+       self.response_cache = response_cache
        self.browser: Browser = None
        
        # Service contexts and pages
@@ -21,17 +89,44 @@ class LLMWebBridge:
        self.chatgpt_context: BrowserContext = None
        self.chatgpt_page: Page = None
        
+       # Streamed response deltas pushed from each page's MutationObserver
+       self._stream_queues: Dict[str, asyncio.Queue] = {}
+       
+       # Responses served from the response cache, and requests whose response
+       # should be stored once it arrives, both keyed by chat URL
+       self._cached_responses: Dict[str, str] = {}
+       self._pending_responses: Dict[str, Tuple[List[Dict[str, str]], str]] = {}
+       # Hash state of each new chat's history, reused when the chat is stored
+       self._prefix_hash_states: Dict[str, Tuple] = {}
+       
+       # Per-service DOM selectors, filled in once each service has logged in
+       self._selectors: Dict[str, Dict[str, str]] = {}
+       # Service owning each page, keyed by id(page) and recorded once at initialization
+       self._page_service: Dict[int, str] = {}
+       # Per-service Playwright locators, built once at login and reused
+       self._locators: Dict[str, Dict] = {}
+       
        # Google auth handlers
        self.claude_auth = GoogleAuth("claude")
        self.chatgpt_auth = GoogleAuth("chatgpt")
        
        self.initialized = False
        self.current_model = None
+       # Model last picked in each service's UI, so unchanged models are not re-selected
+       self._last_selected_model_per_service: Dict[str, Optional[str]] = {"claude": None, "chatgpt": None}
        
        # Development mode settings
        self.debug = config.get('dev', {}).get('debug', False)
        self.slow_mo = config.get('dev', {}).get('slow_mo', 50) if self.debug else 0
        self.timeout = 0 if self.debug else 60000
+       # Navigation only waits for the DOM; element waits use the longer timeout
+       self.navigation_timeout = 0 if self.debug else 15000
+       
+       # Error screenshots run in the background under a rate limit
+       self._screenshot_budget = asyncio.Semaphore(SCREENSHOT_CONCURRENCY)
+       self._screenshot_window_start = 0.0
+       self._screenshot_count = 0
+       self._screenshot_tasks = set()
 
    async def initialize(self):
        """Initialize the browser and log in to services."""
@@ -48,9 +143,32 @@ class LLMWebBridge:
            
            logger.info(f"Browser launched in {'debug' if self.debug else 'headless'} mode")
            
-           # Initialize each service
-           await self._initialize_service("claude", self.config["claude"])
-           await self._initialize_service("chatgpt", self.config["chatgpt"])
+           shared_context = None
+           if self._can_share_context():
+               # One Google account for both services: a single context holds both pages
+               logger.info("Sharing one browser context between Claude and ChatGPT")
+               shared_context = await self._create_context("claude", self.config["claude"])
+           
+           # Initialize both services concurrently; their logins are independent
+           tasks = [
+               asyncio.create_task(
+                   self._initialize_service("claude", self.config["claude"], shared_context)
+               ),
+               asyncio.create_task(
+                   self._initialize_service("chatgpt", self.config["chatgpt"], shared_context)
+               )
+           ]
+           try:
+               await asyncio.gather(*tasks)
+           except BaseException:
+               # Stop the other service and let it unwind before anything is closed
+               for task in tasks:
+                   task.cancel()
+               await asyncio.gather(*tasks, return_exceptions=True)
+               if shared_context:
+                   await self._wait_for_screenshots()
+                   await shared_context.close()
+               raise
            
            self.initialized = True
            logger.info("Bridge initialized successfully")
@@ -59,43 +177,77 @@ class LLMWebBridge:
            logger.error(f"Initialization error: {str(e)}")
            raise
 
-   async def _initialize_service(self, service: str, config: dict):
-       """Initialize a specific service using config."""
-       context = None
-       page = None
-       try:
-           auth_handler = self.claude_auth if service == "claude" else self.chatgpt_auth
-           
-           # Check if we need to perform Google login
-           if config["auth_method"] == "google" and not auth_handler.is_session_valid():
-               logger.info(f"No valid Google session found for {service}, performing login...")
-               # We need to run this synchronously as the Google auth module uses sync API
-               auth_handler.login(
-                   email=config["email"],
-                   password=config["password"],
-                   headless=not self.debug
-               )
-               logger.info(f"Google login completed for {service}")
+   def _can_share_context(self) -> bool:
+       """Whether both services log in with the same Google account."""
+       claude_config = self.config["claude"]
+       chatgpt_config = self.config["chatgpt"]
+       return (
+           claude_config["auth_method"] == chatgpt_config["auth_method"] == "google"
+           and claude_config["email"] == chatgpt_config["email"]
+       )
 
-           # Create context with base configuration
-           context = await self.browser.new_context(
-               viewport={'width': 1920, 'height': 1080},
-               user_agent=GoogleAuth.get_random_user_agent()
+   async def _create_context(self, service: str, config: dict) -> BrowserContext:
+       """Create a browser context, loading the service's Google session if configured."""
+       auth_handler = self.claude_auth if service == "claude" else self.chatgpt_auth
+       
+       # Check if we need to perform Google login
+       if config["auth_method"] == "google" and not auth_handler.is_session_valid():
+           logger.info(f"No valid Google session found for {service}, performing login...")
+           await auth_handler.login(
+               email=config["email"],
+               password=config["password"],
+               headless=not self.debug
            )
+           logger.info(f"Google login completed for {service}")
+
+       # Create context with base configuration
+       context = await self.browser.new_context(
+           viewport={'width': 1920, 'height': 1080},
+           user_agent=GoogleAuth.get_random_user_agent()
+       )
 
+       try:
            # Load Google auth state if using Google auth
            if config["auth_method"] == "google":
                storage_state = auth_handler.load_authentication_state()
                if storage_state:
                    await context.add_cookies(storage_state["cookies"])
-                   for origin, state in storage_state.get("origins", {}).items():
+                   origins = storage_state.get("origins", {})
+                   if origins:
+                       # One init script for all origins instead of one per origin
                        await context.add_init_script(
-                           f"window.localStorage.setItem('{origin}', '{state}')"
+                           "for (const [k, v] of " + json.dumps(list(origins.items())) + ") "
+                           "window.localStorage.setItem(k, v);"
                        )
+       except Exception:
+           await context.close()
+           raise
+       
+       return context
+
+   async def _initialize_service(self, service: str, config: dict,
+                                 shared_context: Optional[BrowserContext] = None):
+       """Initialize a specific service using config, optionally in an existing context."""
+       context = None
+       page = None
+       try:
+           if shared_context:
+               context = shared_context
+           else:
+               context = await self._create_context(service, config)
 
            # Create new page
            page = await context.new_page()
            
+           # Let the page push streamed text to us instead of being polled
+           stream_queue = asyncio.Queue()
+           await page.expose_binding(
+               "onStreamDelta",
+               lambda source, watch_id, delta: stream_queue.put_nowait((watch_id, delta))
+           )
+           await page.add_init_script(STREAM_OBSERVER_SCRIPT)
+           self._stream_queues[service] = stream_queue
+           
            if self.debug:
                # Setup debug listeners
                logger.debug(f"Setting up debug listeners for {service}")
@@ -112,46 +264,83 @@ class LLMWebBridge:
                self.chatgpt_context = context
                self.chatgpt_page = page
            
+           self._page_service[id(page)] = service
            logger.info(f"Successfully initialized {service} service")
            
-       except Exception as e:
-           logger.error(f"Failed to initialize {service}: {str(e)}")
-           if context:
+       except BaseException as e:
+           if isinstance(e, asyncio.CancelledError):
+               logger.info(f"Initialization of {service} cancelled")
+           else:
+               logger.error(f"Failed to initialize {service}: {str(e)}")
+           if context and context is not shared_context:
                try:
+                   await self._wait_for_screenshots()
                    await context.close()
                except Exception as close_error:
                    logger.error(f"Error closing context during failure: {str(close_error)}")
            raise
 
+   def _schedule_screenshot(self, page: Page, path: str):
+       """Take an error screenshot in the background without delaying the caller."""
+       now = time.monotonic()
+       if now - self._screenshot_window_start >= SCREENSHOT_WINDOW:
+           self._screenshot_window_start = now
+           self._screenshot_count = 0
+       if self._screenshot_count >= SCREENSHOT_LIMIT:
+           logger.debug(f"Screenshot rate limit reached, skipping {path}")
+           return
+       self._screenshot_count += 1
+       
+       task = asyncio.create_task(self._take_screenshot(page, path))
+       self._screenshot_tasks.add(task)
+       task.add_done_callback(self._screenshot_tasks.discard)
+
+   async def _wait_for_screenshots(self):
+       """Let pending screenshots finish before their page is closed; each is time-bounded."""
+       if self._screenshot_tasks:
+           await asyncio.gather(*self._screenshot_tasks, return_exceptions=True)
+
+   async def _take_screenshot(self, page: Page, path: str):
+       """Capture a small, bounded-time screenshot."""
+       async with self._screenshot_budget:
+           try:
+               await page.screenshot(path=path, type="jpeg", quality=50, full_page=False, timeout=3000)
+           except Exception as e:
+               logger.warning(f"Failed to take screenshot {path}: {str(e)}")
+
    def _get_current_page(self) -> Page:
        """Get the appropriate page based on the current model."""
        if self.current_model and self.current_model.startswith(ModelProvider.ANTHROPIC):
            return self.claude_page
        return self.chatgpt_page
 
+   def _service_of(self, page: Page) -> str:
+       """Return the service a page belongs to."""
+       return self._page_service[id(page)]
+
    async def _login_claude(self, page: Page, config: dict):
        """Handle Claude login."""
        try:
            if config["auth_method"] == "google":
                logger.info("Starting Claude Google login flow")
-               await page.goto('https://claude.ai/login', wait_until='networkidle', timeout=self.timeout)
+               await page.goto('https://claude.ai/login', wait_until='domcontentloaded', timeout=self.navigation_timeout)
                
                # Click the Google sign-in button
-               google_button = 'button:has-text("Continue with Google")'
-               await page.click(google_button)
+               google_button = page.locator('button:has-text("Continue with Google")').first
+               await google_button.wait_for(state='visible', timeout=self.timeout)
+               await google_button.click()
                
                # Handle the Google account chooser popup
                popup = await page.wait_for_event('popup')
-               await popup.wait_for_load_state('networkidle')
+               await popup.wait_for_load_state('domcontentloaded')
                
                # Click on the first Google account
                account_button = popup.locator('div[role="link"]').first
-               await account_button.click()
+               await account_button.click(timeout=self.timeout)
                
                # Wait for Continue button and click it
-               continue_button = GoogleAuth.get_continue_button_selector()
-               await popup.wait_for_selector(continue_button, state="visible", timeout=self.timeout)
-               await popup.click(continue_button)
+               continue_button = popup.locator(GoogleAuth.get_continue_button_selector()).first
+               await continue_button.click(timeout=self.timeout)
                
                # Wait for Claude to complete authentication
                await page.wait_for_url('https://claude.ai/chat', timeout=self.timeout)
@@ -159,20 +348,33 @@ class LLMWebBridge:
                
            else:
                logger.info("Starting direct Claude login")
-               await page.goto('https://claude.ai/login', wait_until='networkidle', timeout=self.timeout)
-               await page.fill('input[type="email"]', config["email"])
-               await page.fill('input[type="password"]', config["password"])
-               await page.click('button[type="submit"]')
+               await page.goto('https://claude.ai/login', wait_until='domcontentloaded', timeout=self.navigation_timeout)
+               await page.locator('input[type="email"]').first.fill(config["email"], timeout=self.timeout)
+               await page.locator('input[type="password"]').first.fill(config["password"], timeout=self.timeout)
+               await page.locator('button[type="submit"]').first.click(timeout=self.timeout)
                await page.wait_for_url('https://claude.ai/chat', timeout=self.timeout)
            
            logger.info("Logged into Claude")
+           self._selectors["claude"] = {
+               "input": 'textarea[placeholder="Message Claude..."]',
+               "response": '.claude-response',
+               "done": '.response-complete-indicator'
+           }
+           self._locators["claude"] = {
+               "input": page.locator(self._selectors["claude"]["input"]).first,
+               "model_select": page.locator('button[aria-label="Select Model"]').first,
+               "models": {
+                   model_id: page.locator(model.selector).first
+                   for model_id, model in CLAUDE_MODELS.items()
+               }
+           }
            
        except Exception as e:
            logger.error(f"Claude login error: {str(e)}")
            if self.debug:
-               await page.screenshot(path="error_claude_login.png")
+               self._schedule_screenshot(page, "error_claude_login.jpg")
                if 'popup' in locals() and not popup.is_closed():
-                   await popup.screenshot(path="error_claude_popup.png")
+                   self._schedule_screenshot(popup, "error_claude_popup.jpg")
            raise
 
    async def _login_chatgpt(self, page: Page, config: dict):
@@ -180,24 +382,24 @@ class LLMWebBridge:
        try:
            if config["auth_method"] == "google":
                logger.info("Starting ChatGPT Google login flow")
-               await page.goto('https://chat.openai.com/auth/login', wait_until='networkidle', timeout=self.timeout)
+               await page.goto('https://chat.openai.com/auth/login', wait_until='domcontentloaded', timeout=self.navigation_timeout)
                
                # Click the Google sign-in button
-               google_button = 'button:has-text("Continue with Google")'
-               await page.click(google_button)
+               google_button = page.locator('button:has-text("Continue with Google")').first
+               await google_button.wait_for(state='visible', timeout=self.timeout)
+               await google_button.click()
                
                # Handle the Google account chooser popup
                popup = await page.wait_for_event('popup')
-               await popup.wait_for_load_state('networkidle')
+               await popup.wait_for_load_state('domcontentloaded')
                
                # Click on the first Google account
                account_button = popup.locator('div[role="link"]').first
-               await account_button.click()
+               await account_button.click(timeout=self.timeout)
                
                # Wait for Continue button and click it
-               continue_button = GoogleAuth.get_continue_button_selector()
-               await popup.wait_for_selector(continue_button, state="visible", timeout=self.timeout)
-               await popup.click(continue_button)
+               continue_button = popup.locator(GoogleAuth.get_continue_button_selector()).first
+               await continue_button.click(timeout=self.timeout)
                
                # Wait for ChatGPT to complete authentication
                await page.wait_for_url('https://chat.openai.com/', timeout=self.timeout)
@@ -205,20 +407,33 @@ class LLMWebBridge:
                
            else:
                logger.info("Starting direct ChatGPT login")
-               await page.goto('https://chat.openai.com/auth/login', wait_until='networkidle', timeout=self.timeout)
-               await page.fill('input[type="email"]', config["email"])
-               await page.fill('input[type="password"]', config["password"])
-               await page.click('button[type="submit"]')
+               await page.goto('https://chat.openai.com/auth/login', wait_until='domcontentloaded', timeout=self.navigation_timeout)
+               await page.locator('input[type="email"]').first.fill(config["email"], timeout=self.timeout)
+               await page.locator('input[type="password"]').first.fill(config["password"], timeout=self.timeout)
+               await page.locator('button[type="submit"]').first.click(timeout=self.timeout)
                await page.wait_for_url('https://chat.openai.com/', timeout=self.timeout)
            
            logger.info("Logged into ChatGPT")
+           self._selectors["chatgpt"] = {
+               "input": 'textarea[placeholder="Send a message"]',
+               "response": '.markdown',
+               "done": '.response-complete-indicator'
+           }
+           self._locators["chatgpt"] = {
+               "input": page.locator(self._selectors["chatgpt"]["input"]).first,
+               "model_select": page.locator('button[aria-label="Model selector"]').first,
+               "models": {
+                   model_id: page.locator(model.selector).first
+                   for model_id, model in CHATGPT_MODELS.items()
+               }
+           }
            
        except Exception as e:
            logger.error(f"ChatGPT login error: {str(e)}")
            if self.debug:
-               await page.screenshot(path="error_chatgpt_login.png")
+               self._schedule_screenshot(page, "error_chatgpt_login.jpg")
                if 'popup' in locals() and not popup.is_closed():
-                   await popup.screenshot(path="error_chatgpt_popup.png")
+                   self._schedule_screenshot(popup, "error_chatgpt_popup.jpg")
            raise
 
    async def select_model(self, model_id: str) -> bool:
@@ -230,43 +445,50 @@ class LLMWebBridge:
 
            logger.debug(f"Selecting model: {model_id}")
            
-           if model_id.startswith(ModelProvider.ANTHROPIC):
-               if model_id not in CLAUDE_MODELS:
-                   raise ValueError(f"Unsupported Claude model: {model_id}")
-               
-               select_button = 'button[aria-label="Select Model"]'
-               await page.wait_for_selector(select_button, timeout=self.timeout)
-               await page.click(select_button)
-               await page.wait_for_selector(CLAUDE_MODELS[model_id]["selector"], timeout=self.timeout)
-               await page.click(CLAUDE_MODELS[model_id]["selector"])
-               self.current_model = model_id
-               logger.info(f"Selected Claude model: {CLAUDE_MODELS[model_id]['display_name']}")
-               
-           elif model_id.startswith(ModelProvider.OPENAI):
-               if model_id not in CHATGPT_MODELS:
-                   raise ValueError(f"Unsupported ChatGPT model: {model_id}")
-               
-               select_button = 'button[aria-label="Model selector"]'
-               await page.wait_for_selector(select_button, timeout=self.timeout)
-               await page.click(select_button)
-               await page.wait_for_selector(CHATGPT_MODELS[model_id]["selector"], timeout=self.timeout)
-               await page.click(CHATGPT_MODELS[model_id]["selector"])
-               self.current_model = model_id
-               logger.info(f"Selected ChatGPT model: {CHATGPT_MODELS[model_id]['display_name']}")
-               
+           model = MODEL_REGISTRY.get(model_id)
+           if model is None:
+               raise ValueError(f"Unsupported model: {model_id}")
+           
+           if model.provider is ModelProvider.ANTHROPIC:
+               service, service_name = "claude", "Claude"
            else:
-               raise ValueError(f"Unknown model provider in model ID: {model_id}")
+               service, service_name = "chatgpt", "ChatGPT"
+           
+           # Locator clicks wait for the element themselves
+           locators = self._locators[service]
+           await locators["model_select"].click(timeout=self.timeout)
+           await locators["models"][model_id].click(timeout=self.timeout)
+           self.current_model = model_id
+           self._last_selected_model_per_service[service] = model_id
+           logger.info(f"Selected {service_name} model: {model.display_name}")
            
            return True
            
        except Exception as e:
            logger.error(f"Error selecting model {model_id}: {str(e)}")
            if self.debug:
-               await page.screenshot(path=f"error_model_selection_{model_id.replace('/', '_')}.png")
+               self._schedule_screenshot(page, f"error_model_selection_{model_id.replace('/', '_')}.jpg")
            raise
 
+   async def _ensure_model_selected(self, model_id: str):
+       """Select the model unless it is already the one picked in its service's UI."""
+       service = "claude" if model_id.startswith(ModelProvider.ANTHROPIC) else "chatgpt"
+       if self._last_selected_model_per_service[service] == model_id:
+           logger.debug(f"Model {model_id} already selected")
+           return
+       await self.select_model(model_id)
+
    async def process_completion_request(self, model: str, messages: List[Dict[str, str]]) -> Tuple[str, bool]:
        """Process a completion request, returns (chat_url, is_new_chat)."""
+       # A cached response short-circuits the browser entirely
+       if self.response_cache:
+           cached_response = await self.response_cache.find_response(messages, model)
+           if cached_response is not None:
+               logger.debug("Serving response from response cache")
+               cached_url = f"{CACHED_RESPONSE_SCHEME}{uuid.uuid4().hex}"
+               self._cached_responses[cached_url] = cached_response
+               return cached_url, False
+       
        try:
            logger.debug(f"Processing completion request for model: {model}")
            self.current_model = model
@@ -274,35 +496,50 @@ class LLMWebBridge:
            if not page:
                raise ValueError("No active page found")
            
-           # Check for existing conversation
-           existing_chat_url = await self.cache.find_matching_conversation(messages, model)
+           # Check for existing conversation, keyed by a hash of the history before this turn
+           # Hash the history without copying it out of the message list
+           prefix_state, prefix_key = self.cache.hash_prefix(islice(messages, len(messages) - 1), model)
+           existing_chat_url = None
+           if len(messages) > 1:
+               existing_chat_url = await self.cache.find_matching_conversation(messages, model, prefix_key)
            
            if existing_chat_url:
                logger.debug(f"Found existing chat: {existing_chat_url}")
                # Use existing chat
-               await page.goto(existing_chat_url, wait_until='networkidle', timeout=self.timeout)
-               await self.select_model(model)  # Ensure correct model is selected
+               await page.goto(existing_chat_url, wait_until='domcontentloaded', timeout=self.navigation_timeout)
+               # The history renders after the DOM is ready; completion baselines must include it.
+               # New chats fold earlier turns into one opening prompt, so the page can show fewer
+               # replies than the history holds, but always at least one.
+               await page.wait_for_function(
+                   MIN_ELEMENT_COUNT_SCRIPT,
+                   arg=[self._selectors[self._service_of(page)]["done"], 1],
+                   timeout=self.timeout
+               )
+               await self._ensure_model_selected(model)
+               self._pending_responses[existing_chat_url] = (messages, model)
+               self._prefix_hash_states[existing_chat_url] = prefix_state
                return existing_chat_url, False
            else:
                logger.debug("Starting new chat")
                # Start new chat
                if model.startswith(ModelProvider.ANTHROPIC):
-                   await page.goto('https://claude.ai/chat', wait_until='networkidle', timeout=self.timeout)
+                   await page.goto('https://claude.ai/chat', wait_until='domcontentloaded', timeout=self.navigation_timeout)
                else:
-                   await page.goto('https://chat.openai.com/', wait_until='networkidle', timeout=self.timeout)
+                   await page.goto('https://chat.openai.com/', wait_until='domcontentloaded', timeout=self.navigation_timeout)
                
-               await self.select_model(model)
+               await self._ensure_model_selected(model)
                chat_url = page.url
                
-               # Store the new conversation
-               await self.cache.store_conversation(messages, model, chat_url)
+               # The conversation is stored once the first response arrives and the chat has its own URL
                logger.debug(f"Created new chat: {chat_url}")
+               self._pending_responses[chat_url] = (messages, model)
+               self._prefix_hash_states[chat_url] = prefix_state
                return chat_url, True
                
        except Exception as e:
            logger.error(f"Error processing completion request: {str(e)}")
            if self.debug and page:
-               await page.screenshot(path="error_completion_request.png")
+               self._schedule_screenshot(page, "error_completion_request.jpg")
            raise
 
    async def _send_single_message(self, message: str) -> str:
@@ -314,25 +551,25 @@ class LLMWebBridge:
 
            logger.debug(f"Sending message: {message[:50]}...")
            
-           # Determine which service we're using based on the URL
-           if 'claude.ai' in page.url:
-               input_selector = 'textarea[placeholder="Message Claude..."]'
-               response_selector = '.claude-response'
-           else:
-               input_selector = 'textarea[placeholder="Send a message"]'
-               response_selector = '.markdown'
+           service = self._service_of(page)
+           response_selector = self._selectors[service]["response"]
+           done_selector = self._selectors[service]["done"]
+           
+           await self._locators[service]["input"].fill(message, timeout=self.timeout)
            
-           await page.wait_for_selector(input_selector, timeout=self.timeout)
-           await page.fill(input_selector, message)
+           # Earlier responses in this chat already have completion indicators
+           done_baseline = await page.locator(done_selector).count()
            await page.keyboard.press('Enter')
            
-           # Wait for response
-           await page.wait_for_selector(response_selector, state='visible', timeout=self.timeout)
+           # Wait for the response to finish, not just to appear
+           await page.wait_for_function(
+               "([selector, baseline]) => document.querySelectorAll(selector).length > baseline",
+               arg=[done_selector, done_baseline],
+               timeout=self.timeout
+           )
            
-           # Get the latest response
-           responses = await page.query_selector_all(response_selector)
-           latest_response = responses[-1]
-           response_text = await latest_response.text_content()
+           # Get the latest response in one round trip, without a handle per response
+           response_text = await page.evaluate(LATEST_RESPONSE_TEXT_SCRIPT, response_selector)
            
            logger.debug(f"Received response: {response_text[:50]}...")
            return response_text
@@ -340,32 +577,30 @@ class LLMWebBridge:
        except Exception as e:
            logger.error(f"Error sending message: {str(e)}")
            if self.debug and page:
-               await page.screenshot(path="error_send_message.png")
+               self._schedule_screenshot(page, "error_send_message.jpg")
            raise
 
    async def send_message(self, message: str, is_new_chat: bool, chat_url: str, 
                          full_messages: List[Dict[str, str]] = None) -> str:
        """Send a message and handle the response."""
        try:
+           cached_response = self._cached_responses.pop(chat_url, None)
+           if cached_response is not None:
+               return cached_response
+           
            if is_new_chat and full_messages:
-               logger.debug("Sending previous messages for context")
-               # Need to send all messages for context
-               for msg in full_messages[:-1]:
-                   if msg['role'] == 'user':
-                       await self._send_single_message(msg['content'])
-                       # Wait for response to complete
-                       page = self._get_current_page()
-                       await page.wait_for_selector('.response-complete-indicator', timeout=self.timeout)
-           
-           # Send the final/new message
-           response_text = await self._send_single_message(message)
-           
-           # Update conversation cache
-           await self.cache.update_conversation(
-               chat_url,
-               {'role': 'user', 'content': message},
-               response_text
-           )
+               # Fold prior turns into one opening prompt instead of replaying them
+               logger.debug("Sending previous messages as context in the opening prompt")
+               response_text = await self._send_single_message(
+                   self._build_opening_message(message, full_messages)
+               )
+               await self._store_new_conversation(chat_url, full_messages, response_text)
+           else:
+               response_text = await self._send_single_message(message)
+               
+               # Update conversation cache
+               await self._update_conversation(chat_url, message, response_text)
+           await self._store_response(chat_url, response_text)
            
            return response_text
            
@@ -374,21 +609,25 @@ class LLMWebBridge:
            if self.debug:
                page = self._get_current_page()
                if page:
-                   await page.screenshot(path="error_send_message_complete.png")
+                   self._schedule_screenshot(page, "error_send_message_complete.jpg")
            raise
+       finally:
+           self.release_request(chat_url)
 
    async def stream_response(self, message: str, is_new_chat: bool, chat_url: str,
                            full_messages: List[Dict[str, str]] = None) -> AsyncGenerator[str, None]:
        """Stream the response for a message."""
        try:
+           cached_response = self._cached_responses.pop(chat_url, None)
+           if cached_response is not None:
+               yield cached_response
+               return
+           
+           prompt = message
            if is_new_chat and full_messages:
-               logger.debug("Sending previous messages for context in streaming mode")
-               # Send previous messages first
-               for msg in full_messages[:-1]:
-                   if msg['role'] == 'user':
-                       await self._send_single_message(msg['content'])
-                       page = self._get_current_page()
-                       await page.wait_for_selector('.response-complete-indicator', timeout=self.timeout)
+               # Fold prior turns into one opening prompt instead of replaying them
+               logger.debug("Sending previous messages as context in the opening prompt")
+               prompt = self._build_opening_message(message, full_messages)
            
            logger.debug(f"Starting streaming response for message: {message[:50]}...")
            
@@ -397,79 +636,132 @@ class LLMWebBridge:
                raise ValueError("No active page found")
 
            # Send the final message
-           if 'claude.ai' in page.url:
-               input_selector = 'textarea[placeholder="Message Claude..."]'
-               response_selector = '.claude-response'
-           else:
-               input_selector = 'textarea[placeholder="Send a message"]'
-               response_selector = '.markdown'
+           service = self._service_of(page)
+           selectors = self._selectors[service]
+           response_selector = selectors["response"]
+           stream_queue = self._stream_queues[service]
+           
+           await self._locators[service]["input"].fill(prompt, timeout=self.timeout)
+           # Re-arming disconnects any observer left running by an interrupted stream
+           watch_id = await page.evaluate(
+               "([responseSelector, doneSelector]) => window.__aipiWatchResponse(responseSelector, doneSelector)",
+               [response_selector, selectors["done"]]
+           )
            
-           await page.wait_for_selector(input_selector, timeout=self.timeout)
-           await page.fill(input_selector, message)
+           # Discard deltas left over from that stream; late ones are skipped by watch id below
+           while not stream_queue.empty():
+               stream_queue.get_nowait()
            await page.keyboard.press('Enter')
            
-           # Wait for response to start
-           await page.wait_for_selector(response_selector, state='visible', timeout=self.timeout)
-           
-           # Get the latest response container
-           responses = await page.query_selector_all(response_selector)
-           latest_response = responses[-1]
-           
-           # Initialize previous content
-           prev_content = ""
-           response_complete = False
-           complete_wait_count = 0
-           max_complete_wait = 50  # 5 seconds total wait for completion
+           response_parts = []
+           # Only a response whose completion was observed goes to the response cache
+           completed = False
            
            logger.debug("Starting response streaming")
-           while not response_complete and complete_wait_count < max_complete_wait:
-               current_content = await latest_response.text_content()
+           while True:
+               # Allow the full page timeout for the first token, then a short idle window
+               wait_timeout = STREAM_IDLE_TIMEOUT if response_parts else (self.timeout / 1000 or None)
+               try:
+                   delta_watch_id, new_content = await asyncio.wait_for(stream_queue.get(), timeout=wait_timeout)
+               except asyncio.TimeoutError:
+                   logger.warning("Response streaming timed out waiting for completion")
+                   break
                
-               if current_content != prev_content:
-                   # Reset wait count when content changes
-                   complete_wait_count = 0
-                   # Calculate the difference (new tokens)
-                   new_content = current_content[len(prev_content):]
-                   if new_content:
-                       if self.debug:
-                           logger.debug(f"Streaming chunk: {new_content[:50]}...")
-                       yield new_content
-                   prev_content = current_content
+               if delta_watch_id != watch_id:
+                   continue
                
-               # Check if response is complete
-               done_indicator = await page.query_selector('.response-complete-indicator')
-               if done_indicator:
-                   response_complete = True
+               if new_content is None:
                    logger.debug("Response streaming completed")
-               else:
-                   complete_wait_count += 1
-                   await asyncio.sleep(0.1)
-           
-           if complete_wait_count >= max_complete_wait:
-               logger.warning("Response streaming timed out waiting for completion")
+                   completed = True
+                   break
+               
+               if self.debug:
+                   logger.debug(f"Streaming chunk: {new_content[:50]}...")
+               response_parts.append(new_content)
+               yield new_content
            
            # Update conversation cache with complete response
-           await self.cache.update_conversation(
-               chat_url,
-               {'role': 'user', 'content': message},
-               prev_content
-           )
+           response_text = "".join(response_parts)
+           if is_new_chat and full_messages:
+               await self._store_new_conversation(chat_url, full_messages, response_text)
+           else:
+               await self._update_conversation(chat_url, message, response_text)
+           await self._store_response(chat_url, response_text, complete=completed)
            
        except Exception as e:
            logger.error(f"Error in stream_response: {str(e)}")
            if self.debug:
                page = self._get_current_page()
                if page:
-                   await page.screenshot(path="error_stream_response.png")
+                   self._schedule_screenshot(page, "error_stream_response.jpg")
            raise
+       finally:
+           # Also runs when the client disconnects and the generator is closed mid-stream
+           self.release_request(chat_url)
+
+   def release_request(self, chat_url: str):
+       """Drop per-request state for a chat URL once its request is over, however it ended."""
+       self._cached_responses.pop(chat_url, None)
+       self._pending_responses.pop(chat_url, None)
+       self._prefix_hash_states.pop(chat_url, None)
+
+   def _build_opening_message(self, message: str, full_messages: List[Dict[str, str]]) -> str:
+       """Build the first prompt of a new chat, carrying all previous turns as context."""
+       context = full_messages[:-1]
+       if not context:
+           return message
+       context_blob = "\n\n".join(f"{msg['role']}: {msg['content']}" for msg in context)
+       return f"{context_blob}\n\nuser: {message}"
+
+   async def _store_new_conversation(self, chat_url: str, full_messages: List[Dict[str, str]],
+                                     response_text: str):
+       """Cache a new chat under its real URL so the next turn reuses it."""
+       page = self._get_current_page()
+       prefix_state = self._prefix_hash_states.pop(chat_url, None)
+       if page.url == chat_url:
+           # Still on the new-chat landing page; reopening it would not restore this chat
+           logger.debug(f"Chat URL not assigned yet, not caching conversation at {chat_url}")
+           return
+       await self.cache.store_conversation(
+           full_messages + [{'role': 'assistant', 'content': response_text}],
+           self.current_model,
+           page.url,
+           prefix_state=prefix_state
+       )
+
+   async def _update_conversation(self, chat_url: str, message: str, response_text: str):
+       """Append a turn to a reused chat, re-keying it to the history that now includes the turn."""
+       prefix_state = self._prefix_hash_states.pop(chat_url, None)
+       pending = self._pending_responses.get(chat_url)
+       user_message = pending[0][-1] if pending else {'role': 'user', 'content': message}
+       
+       conversation_hash = None
+       if prefix_state is not None and pending:
+           _, conversation_hash = self.cache.hash_prefix(
+               [user_message, {'role': 'assistant', 'content': response_text}],
+               pending[1],
+               prefix_state
+           )
+       await self.cache.update_conversation(chat_url, user_message, response_text, conversation_hash)
+
+   async def _store_response(self, chat_url: str, response_text: str, complete: bool = True):
+       """Store a completed response in the response cache, if enabled.
+
+       Truncated responses (``complete=False``) are dropped so they are never replayed.
+       """
+       pending = self._pending_responses.pop(chat_url, None)
+       if self.response_cache and pending and response_text and complete:
+           messages, model = pending
+           await self.response_cache.store_response(messages, model, response_text)
 
    async def cleanup(self):
        """Cleanup resources."""
        try:
            logger.info("Cleaning up browser resources")
+           await self._wait_for_screenshots()
            if self.claude_context:
                await self.claude_context.close()
-           if self.chatgpt_context:
+           if self.chatgpt_context and self.chatgpt_context is not self.claude_context:
                await self.chatgpt_context.close()
            if self.browser:
                await self.browser.close()
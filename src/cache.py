@@ -1,21 +1,125 @@
 import sqlite3
 import aiosqlite
-from datetime import datetime, timedelta
+from contextlib import asynccontextmanager
 import hashlib
-from typing import List, Dict, Optional
+import json
+import time
+from itertools import islice
+from typing import Any, Iterable, List, Dict, Optional, Tuple
 import logging
 import asyncio
+from pathlib import Path
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
 
 logger = logging.getLogger(__name__)
 
+# Per-connection settings, also valid on read-only connections
+SQLITE_READER_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+# Applied to every long-lived connection: WAL lets readers proceed alongside the writer
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+) + SQLITE_READER_PRAGMAS
+
+# Nearest neighbours checked per semantic lookup, so expired entries don't hide live ones
+SEMANTIC_SEARCH_K = 8
+
+# Read-only connections kept open per cache, so lookups run in parallel with writes
+READER_POOL_SIZE = 4
+
+async def open_connection(db_path: str) -> aiosqlite.Connection:
+    """Open a connection meant to be kept for the lifetime of the app."""
+    db = await aiosqlite.connect(db_path)
+    for pragma in SQLITE_PRAGMAS:
+        await db.execute(pragma)
+    return db
+
+async def open_reader(db_path: str) -> aiosqlite.Connection:
+    """Open a long-lived read-only connection; the database must already be in WAL mode."""
+    db = await aiosqlite.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    for pragma in SQLITE_READER_PRAGMAS:
+        await db.execute(pragma)
+    return db
+
+@asynccontextmanager
+async def transaction(db: aiosqlite.Connection, write_lock: asyncio.Lock):
+    """Run writes in a single transaction, one writer at a time."""
+    async with write_lock:
+        await db.execute("BEGIN")
+        try:
+            yield db
+        except BaseException:
+            await db.rollback()
+            raise
+        await db.commit()
+
+def resolve_hash_algorithm(algorithm: str) -> str:
+    """Validate a configured hash algorithm, falling back to blake2b when blake3 is missing."""
+    if algorithm not in ("blake2b", "blake3"):
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+    if algorithm == "blake3" and blake3 is None:
+        logger.warning("blake3 not installed, hashing with blake2b")
+        return "blake2b"
+    return algorithm
+
+def new_hasher(algorithm: str, digest_size: int, data: bytes = b""):
+    """Create an incremental hasher; blake3 always produces a 32-byte digest."""
+    if algorithm == "blake3":
+        return blake3(data)
+    return hashlib.blake2b(data, digest_size=digest_size)
+
+def canonical_json(messages: List[Dict[str, str]]) -> str:
+    """Serialize messages compactly and deterministically; order is kept since it matters for chat."""
+    return json.dumps(messages, separators=(',', ':'), ensure_ascii=False)
+
 class ConversationCache:
-    def __init__(self, db_path: str, cleanup_interval: int = 3600, max_age: int = 86400):
+    def __init__(self, db_path: str, cleanup_interval: int = 3600, max_age: int = 86400,
+                 hash_algorithm: str = "blake2b"):
         self.db_path = db_path
         self.cleanup_interval = cleanup_interval
         self.max_age = max_age
+        self.hash_algorithm = resolve_hash_algorithm(hash_algorithm)
         self.cleanup_task = None
+        self._db: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        # Idle read-only connections; each lookup borrows one
+        self._readers: asyncio.Queue = asyncio.Queue()
         self.init_db()
 
+    async def connect(self):
+        """Open the writer and reader connections - should be called after event loop is running"""
+        # The writer switches the database to WAL before any reader opens it
+        self._db = await open_connection(self.db_path)
+        readers = await asyncio.gather(*(open_reader(self.db_path) for _ in range(READER_POOL_SIZE)))
+        for reader in readers:
+            self._readers.put_nowait(reader)
+
+    async def close(self):
+        """Stop the cleanup task and close all connections."""
+        if self.cleanup_task:
+            self.cleanup_task.cancel()
+        while not self._readers.empty():
+            await self._readers.get_nowait().close()
+        if self._db:
+            await self._db.close()
+            self._db = None
+
+    @asynccontextmanager
+    async def _reader(self):
+        """Borrow a read-only connection from the pool, waiting if all are busy."""
+        db = await self._readers.get()
+        try:
+            yield db
+        finally:
+            self._readers.put_nowait(db)
+
     async def start_cleanup(self):
         """Start the cleanup task - should be called after event loop is running"""
         self.cleanup_task = asyncio.create_task(self._periodic_cleanup())
@@ -46,116 +150,444 @@ class ConversationCache:
             )
         ''')
         
+        # Message lookups/deletes by conversation (in insertion order) and expiry scans
+        c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_messages_conv
+            ON messages (conversation_hash, timestamp)
+        ''')
+        c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_conversations_last_used
+            ON conversations (last_used)
+        ''')
+        
+        # Each web chat holds one conversation; older databases may have duplicate
+        # URLs, so keep the most recently used row per URL before indexing
+        has_url_index = c.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_conversations_url'"
+        ).fetchone()
+        if not has_url_index:
+            c.execute('''
+                DELETE FROM conversations WHERE rowid NOT IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, ROW_NUMBER() OVER (
+                            PARTITION BY web_chat_url ORDER BY last_used DESC, rowid DESC
+                        ) AS rank
+                        FROM conversations
+                    ) WHERE rank = 1
+                )
+            ''')
+            c.execute('''
+                DELETE FROM messages WHERE conversation_hash NOT IN (
+                    SELECT conversation_hash FROM conversations
+                )
+            ''')
+            c.execute('''
+                CREATE UNIQUE INDEX idx_conversations_url
+                ON conversations (web_chat_url)
+            ''')
+        
         conn.commit()
         conn.close()
 
-    def generate_conversation_hash(self, messages: List[Dict[str, str]], model: str) -> str:
-        """Generate a unique hash for a conversation based on messages and model."""
-        conversation_str = f"{model}:"
+    def hash_prefix(self, messages: Iterable[Dict[str, str]], model: str,
+                    prefix_state: Optional[Tuple[Any, int]] = None) -> Tuple[Tuple[Any, int], str]:
+        """Hash messages, returning a resumable state along with the digest.
+
+        Messages are fed to the hasher one at a time, producing the same digest as
+        hashing ``f"{model}:{canonical_json(messages)}"`` without building that string.
+        The returned state is ``(hasher, message_count)``; passing it back as
+        ``prefix_state`` continues after those messages instead of rehashing them.
+        """
+        if prefix_state is None:
+            hasher = new_hasher(self.hash_algorithm, 16, f"{model}:[".encode())
+            count = 0
+        else:
+            hasher, count = prefix_state
+            hasher = hasher.copy()
+        
         for msg in messages:
-            conversation_str += f"{msg['role']}:{msg['content']};"
-        return hashlib.sha256(conversation_str.encode()).hexdigest()
+            if count:
+                hasher.update(b",")
+            hasher.update(json.dumps(msg, separators=(',', ':'), ensure_ascii=False).encode())
+            count += 1
+        
+        final = hasher.copy()
+        final.update(b"]")
+        return (hasher, count), final.hexdigest()
 
-    async def find_matching_conversation(self, messages: List[Dict[str, str]], model: str) -> Optional[str]:
-        """Find an existing conversation URL that matches the message history."""
-        if not messages[:-1]:  # No previous messages
-            return None
-            
-        conversation_hash = self.generate_conversation_hash(messages[:-1], model)
+    def generate_conversation_hash(self, messages: List[Dict[str, str]], model: str) -> str:
+        """Generate a unique hash (16 bytes with blake2b) for a conversation based on messages and model."""
+        return self.hash_prefix(messages, model)[1]
+
+    async def find_matching_conversation(self, messages: List[Dict[str, str]], model: str,
+                                         prefix_key: Optional[str] = None) -> Optional[str]:
+        """Find an existing conversation URL that matches the message history.
+
+        ``prefix_key`` is the precomputed hash of ``messages[:-1]``; when given,
+        the messages are not hashed again.
+        """
+        if prefix_key is None:
+            if len(messages) <= 1:  # No previous messages
+                return None
+            _, prefix_key = self.hash_prefix(islice(messages, len(messages) - 1), model)
+        conversation_hash = prefix_key
         
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                "SELECT web_chat_url FROM conversations WHERE conversation_hash = ?",
-                (conversation_hash,)
-            ) as cursor:
-                result = await cursor.fetchone()
-                return result[0] if result else None
+        async with self._reader() as db, db.execute(
+            "SELECT web_chat_url FROM conversations WHERE conversation_hash = ?",
+            (conversation_hash,)
+        ) as cursor:
+            result = await cursor.fetchone()
+            return result[0] if result else None
 
-    async def store_conversation(self, messages: List[Dict[str, str]], model: str, web_chat_url: str):
-        """Store a new conversation and its messages."""
-        conversation_hash = self.generate_conversation_hash(messages, model)
+    async def store_conversation(self, messages: List[Dict[str, str]], model: str, web_chat_url: str,
+                                 prefix_state: Optional[Tuple[Any, int]] = None):
+        """Store a new conversation and its messages.
+
+        ``prefix_state`` comes from :meth:`hash_prefix` over the leading messages
+        (e.g. the history looked up in :meth:`find_matching_conversation`), so only
+        the remaining messages are hashed.
+        """
+        if prefix_state is None:
+            conversation_hash = self.generate_conversation_hash(messages, model)
+        else:
+            _, conversation_hash = self.hash_prefix(islice(messages, prefix_state[1], None), model, prefix_state)
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with transaction(self._db, self._write_lock) as db:
+            # A chat URL holds one conversation; a different one stored under it is replaced
+            await db.execute(
+                """
+                DELETE FROM messages WHERE conversation_hash IN (
+                    SELECT conversation_hash FROM conversations
+                    WHERE web_chat_url = ? AND conversation_hash != ?
+                )
+                """,
+                (web_chat_url, conversation_hash)
+            )
+            await db.execute(
+                "DELETE FROM conversations WHERE web_chat_url = ? AND conversation_hash != ?",
+                (web_chat_url, conversation_hash)
+            )
+            
+            # Storing the same conversation again refreshes it instead of failing
             await db.execute(
                 """
                 INSERT INTO conversations (conversation_hash, web_chat_url, model, last_used)
                 VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(conversation_hash) DO UPDATE SET
+                    last_used = CURRENT_TIMESTAMP,
+                    web_chat_url = excluded.web_chat_url
                 """,
                 (conversation_hash, web_chat_url, model)
             )
+            await db.execute(
+                "DELETE FROM messages WHERE conversation_hash = ?",
+                (conversation_hash,)
+            )
             
-            for msg in messages:
+            await db.executemany(
+                """
+                INSERT INTO messages (conversation_hash, role, content)
+                VALUES (?, ?, ?)
+                """,
+                [(conversation_hash, msg['role'], msg['content']) for msg in messages]
+            )
+
+    async def update_conversation(self, web_chat_url: str, new_message: Dict[str, str], response_content: str,
+                                  conversation_hash: Optional[str] = None):
+        """Update existing conversation with new message and response.
+
+        ``conversation_hash`` is the hash of the whole conversation including this
+        turn; when given, the conversation is re-keyed to it so the next turn's
+        history lookup finds it.
+        """
+        async with transaction(self._db, self._write_lock) as db:
+            if conversation_hash is not None:
+                # Another chat stored under the new key is superseded by this one
+                await db.execute(
+                    """
+                    DELETE FROM messages WHERE conversation_hash = ? AND conversation_hash NOT IN (
+                        SELECT conversation_hash FROM conversations WHERE web_chat_url = ?
+                    )
+                    """,
+                    (conversation_hash, web_chat_url)
+                )
+                await db.execute(
+                    "DELETE FROM conversations WHERE conversation_hash = ? AND web_chat_url != ?",
+                    (conversation_hash, web_chat_url)
+                )
                 await db.execute(
                     """
-                    INSERT INTO messages (conversation_hash, role, content)
-                    VALUES (?, ?, ?)
+                    UPDATE messages SET conversation_hash = ? WHERE conversation_hash = (
+                        SELECT conversation_hash FROM conversations WHERE web_chat_url = ?
+                    )
                     """,
-                    (conversation_hash, msg['role'], msg['content'])
+                    (conversation_hash, web_chat_url)
+                )
+                await db.execute(
+                    "UPDATE conversations SET conversation_hash = ? WHERE web_chat_url = ?",
+                    (conversation_hash, web_chat_url)
                 )
             
-            await db.commit()
-
-    async def update_conversation(self, web_chat_url: str, new_message: Dict[str, str], response_content: str):
-        """Update existing conversation with new message and response."""
-        async with aiosqlite.connect(self.db_path) as db:
             await db.execute(
                 "UPDATE conversations SET last_used = CURRENT_TIMESTAMP WHERE web_chat_url = ?",
                 (web_chat_url,)
             )
             
-            async with db.execute(
-                "SELECT conversation_hash FROM conversations WHERE web_chat_url = ?",
-                (web_chat_url,)
-            ) as cursor:
-                result = await cursor.fetchone()
-                if not result:
-                    return
+            # Resolve the conversation inside the INSERT; nothing is inserted for an unknown URL
+            await db.executemany(
+                """
+                INSERT INTO messages (conversation_hash, role, content)
+                SELECT conversation_hash, ?, ? FROM conversations WHERE web_chat_url = ?
+                """,
+                [
+                    (new_message['role'], new_message['content'], web_chat_url),
+                    ('assistant', response_content, web_chat_url)
+                ]
+            )
+
+    def _cleanup_sync(self) -> int:
+        """Delete expired conversations on a dedicated connection, returning how many were removed."""
+        # last_used is stored by SQLite as UTC 'YYYY-MM-DD HH:MM:SS', so compute the cutoff there too
+        cutoff = f"-{self.max_age} seconds"
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                # Delete messages first (foreign key constraint)
+                conn.execute(
+                    """
+                    DELETE FROM messages WHERE conversation_hash IN (
+                        SELECT conversation_hash FROM conversations WHERE last_used < datetime('now', ?)
+                    )
+                    """,
+                    (cutoff,)
+                )
+                cursor = conn.execute(
+                    "DELETE FROM conversations WHERE last_used < datetime('now', ?)",
+                    (cutoff,)
+                )
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    async def _periodic_cleanup(self):
+        """Periodically remove old conversations."""
+        while True:
+            try:
+                # Runs in a worker thread so the shared connections stay free; the lock
+                # only makes app writes wait instead of hitting SQLITE_BUSY
+                async with self._write_lock:
+                    removed = await asyncio.to_thread(self._cleanup_sync)
                 
-                conversation_hash = result[0]
+                if removed:
+                    logger.info(f"Cleaned up {removed} old conversations")
+                
+            except Exception as e:
+                logger.error(f"Error during conversation cleanup: {str(e)}")
             
-            await db.execute(
-                "INSERT INTO messages (conversation_hash, role, content) VALUES (?, ?, ?)",
-                (conversation_hash, new_message['role'], new_message['content'])
+            await asyncio.sleep(self.cleanup_interval)
+
+class ResponseCache:
+    """Cache of complete assistant responses, so repeated prompts never reach the browser.
+
+    Exact hits are keyed by a hash of the full message list. When ``semantic`` is
+    enabled and an embedding backend (fastembed or sentence-transformers) plus
+    faiss are installed, the last user message is also matched by cosine
+    similarity against previously answered prompts that followed the same history.
+    """
+
+    def __init__(self, db_path: str, cleanup_interval: int = 3600, max_age: int = 86400,
+                 semantic: bool = False, similarity_threshold: float = 0.92,
+                 embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+                 hash_algorithm: str = "blake2b"):
+        self.db_path = db_path
+        self.cleanup_interval = cleanup_interval
+        self.max_age = max_age
+        self.hash_algorithm = resolve_hash_algorithm(hash_algorithm)
+        self.similarity_threshold = similarity_threshold
+        self.cleanup_task = None
+        self._db: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._embed = None
+        # hash of (model, history before the prompt) -> (faiss index, (response, created_at) in index order)
+        self._indexes: Dict[str, Tuple[Any, List[Tuple[str, float]]]] = {}
+        if semantic:
+            self._embed = self._load_embedder(embedding_model)
+        self.init_db()
+
+    async def connect(self):
+        """Open the shared connection - should be called after event loop is running"""
+        self._db = await open_connection(self.db_path)
+
+    async def close(self):
+        """Stop the cleanup task and close the shared connection."""
+        if self.cleanup_task:
+            self.cleanup_task.cancel()
+        if self._db:
+            await self._db.close()
+            self._db = None
+
+    async def start_cleanup(self):
+        """Start the cleanup task - should be called after event loop is running"""
+        self.cleanup_task = asyncio.create_task(self._periodic_cleanup())
+
+    def init_db(self):
+        """Initialize SQLite database with the responses table."""
+        conn = sqlite3.connect(self.db_path)
+        c = conn.cursor()
+        
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                request_hash TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT,
+                created_at REAL
             )
+        ''')
+        
+        c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_responses_created_at
+            ON responses (created_at)
+        ''')
+        
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def _load_embedder(model_name: str):
+        """Return a function embedding a string to a normalized float32 vector, or None."""
+        try:
+            import faiss  # noqa: F401
+            import numpy as np
+        except ImportError:
+            logger.warning("faiss/numpy not installed, semantic response cache disabled")
+            return None
+        
+        try:
+            from fastembed import TextEmbedding
+            model = TextEmbedding(model_name)
+            def encode(text: str):
+                return np.asarray(next(iter(model.embed([text]))), dtype="float32")
+        except ImportError:
+            try:
+                from sentence_transformers import SentenceTransformer
+                model = SentenceTransformer(model_name)
+                def encode(text: str):
+                    return np.asarray(model.encode(text), dtype="float32")
+            except ImportError:
+                logger.warning("No embedding backend installed, semantic response cache disabled")
+                return None
+        
+        def embed(text: str):
+            vector = encode(text)
+            return (vector / max(np.linalg.norm(vector), 1e-12)).reshape(1, -1)
+        return embed
+
+    def generate_request_hash(self, messages: List[Dict[str, str]], model: str) -> str:
+        """Generate a 32-byte hash of the canonical JSON form of a request."""
+        return new_hasher(self.hash_algorithm, 32, f"{model}:{canonical_json(messages)}".encode()).hexdigest()
+
+    @staticmethod
+    def _last_user_message(messages: List[Dict[str, str]]) -> Optional[str]:
+        for msg in reversed(messages):
+            if msg['role'] == 'user':
+                return msg['content']
+        return None
+
+    def _semantic_scope(self, messages: List[Dict[str, str]], model: str) -> str:
+        """Key of the index a prompt is matched in: replies like "yes" only make sense after the same history."""
+        return self.generate_request_hash(messages[:-1], model)
+
+    async def find_response(self, messages: List[Dict[str, str]], model: str) -> Optional[str]:
+        """Return a cached response for this request, trying exact then semantic matches."""
+        request_hash = self.generate_request_hash(messages, model)
+        
+        async with self._db.execute(
+            "SELECT response FROM responses WHERE request_hash = ? AND created_at >= ?",
+            (request_hash, time.time() - self.max_age)
+        ) as cursor:
+            result = await cursor.fetchone()
+            if result:
+                return result[0]
+        
+        if self._embed is None:
+            return None
+        scope = self._semantic_scope(messages, model)
+        if scope not in self._indexes:
+            return None
+        prompt = self._last_user_message(messages)
+        if prompt is None:
+            return None
+        
+        index, responses = self._indexes[scope]
+        vector = await asyncio.to_thread(self._embed, prompt)
+        scores, ids = index.search(vector, min(SEMANTIC_SEARCH_K, index.ntotal))
+        cutoff = time.time() - self.max_age
+        # Results are ordered by similarity; take the best one that has not expired
+        for score, i in zip(scores[0], ids[0]):
+            if i == -1 or score < self.similarity_threshold:
+                break
+            response, created_at = responses[i]
+            if created_at >= cutoff:
+                logger.debug(f"Semantic cache hit (similarity {score:.3f})")
+                return response
+        return None
+
+    async def store_response(self, messages: List[Dict[str, str]], model: str, response: str):
+        """Store a complete response for a request."""
+        request_hash = self.generate_request_hash(messages, model)
+        
+        async with transaction(self._db, self._write_lock) as db:
             await db.execute(
-                "INSERT INTO messages (conversation_hash, role, content) VALUES (?, ?, ?)",
-                (conversation_hash, 'assistant', response_content)
+                "INSERT OR REPLACE INTO responses (request_hash, model, response, created_at) VALUES (?, ?, ?, ?)",
+                (request_hash, model, response, time.time())
             )
-            
-            await db.commit()
+        
+        if self._embed is None:
+            return
+        prompt = self._last_user_message(messages)
+        if prompt is None:
+            return
+        
+        import faiss
+        scope = self._semantic_scope(messages, model)
+        vector = await asyncio.to_thread(self._embed, prompt)
+        if scope not in self._indexes:
+            self._indexes[scope] = (faiss.IndexFlatIP(vector.shape[1]), [])
+        index, responses = self._indexes[scope]
+        index.add(vector)
+        responses.append((response, time.time()))
+
+    def _prune_indexes(self):
+        """Drop expired entries from the semantic indexes, and indexes left empty."""
+        if not self._indexes:
+            return
+        import faiss
+        cutoff = time.time() - self.max_age
+        for scope, (index, responses) in list(self._indexes.items()):
+            live = [i for i, (_, created_at) in enumerate(responses) if created_at >= cutoff]
+            if not live:
+                del self._indexes[scope]
+            elif len(live) < len(responses):
+                pruned = faiss.IndexFlatIP(index.d)
+                pruned.add(index.reconstruct_n(0, index.ntotal)[live])
+                self._indexes[scope] = (pruned, [responses[i] for i in live])
 
     async def _periodic_cleanup(self):
-        """Periodically remove old conversations."""
+        """Periodically remove expired responses."""
         while True:
             try:
-                async with aiosqlite.connect(self.db_path) as db:
-                    cutoff_time = datetime.now() - timedelta(seconds=self.max_age)
-                    
-                    # Get old conversation hashes
-                    async with db.execute(
-                        "SELECT conversation_hash FROM conversations WHERE last_used < ?",
-                        (cutoff_time.isoformat(),)
-                    ) as cursor:
-                        old_conversations = await cursor.fetchall()
-                    
-                    for (conv_hash,) in old_conversations:
-                        # Delete messages first (foreign key constraint)
-                        await db.execute(
-                            "DELETE FROM messages WHERE conversation_hash = ?",
-                            (conv_hash,)
-                        )
-                        # Delete conversation
-                        await db.execute(
-                            "DELETE FROM conversations WHERE conversation_hash = ?",
-                            (conv_hash,)
-                        )
-                    
-                    await db.commit()
-                    
-                    if old_conversations:
-                        logger.info(f"Cleaned up {len(old_conversations)} old conversations")
+                async with transaction(self._db, self._write_lock) as db:
+                    cursor = await db.execute(
+                        "DELETE FROM responses WHERE created_at < ?",
+                        (time.time() - self.max_age,)
+                    )
+                
+                if cursor.rowcount:
+                    logger.info(f"Cleaned up {cursor.rowcount} cached responses")
+                
+                self._prune_indexes()
                 
             except Exception as e:
-                logger.error(f"Error during conversation cleanup: {str(e)}")
+                logger.error(f"Error during response cleanup: {str(e)}")
             
             await asyncio.sleep(self.cleanup_interval)
@@ -1,11 +1,49 @@
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
 import yaml
 from dotenv import load_dotenv
 
+# Whole-value "${VAR}" placeholders
+_ENV_RE = re.compile(r'^\$\{([^}]+)\}$')
+
+_dotenv_loaded = False
+
+def _load_dotenv_once():
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        load_dotenv()
+        _dotenv_loaded = True
+
+def _replace_env_vars(obj):
+    """Substitute env var placeholders in place, only touching values that change."""
+    if isinstance(obj, dict):
+        items = obj.items()
+    elif isinstance(obj, list):
+        items = enumerate(obj)
+    else:
+        return
+
+    replacements = []
+    for key, value in items:
+        if isinstance(value, str):
+            match = _ENV_RE.match(value)
+            if match:
+                replacements.append((key, os.getenv(match.group(1), value)))
+        else:
+            _replace_env_vars(value)
+
+    for key, value in replacements:
+        obj[key] = value
+
+@lru_cache(maxsize=1)
 def load_config():
-    """Load and process configuration from yaml and env vars."""
-    load_dotenv()
+    """Load and process configuration from yaml and env vars.
+
+    The file is parsed once; later calls return the same config object.
+    """
+    _load_dotenv_once()
     
     config_path = Path("config/config.yaml")
     if not config_path.exists():
@@ -16,18 +54,10 @@ def load_config():
     with open(config_path, "r") as f:
         config = yaml.safe_load(f)
     
-    def replace_env_vars(obj):
-        if isinstance(obj, dict):
-            return {k: replace_env_vars(v) for k, v in obj.items()}
-        elif isinstance(obj, str) and obj.startswith("${") and obj.endswith("}"):
-            env_var = obj[2:-1]
-            return os.getenv(env_var, obj)
-        return obj
-    
-    config = replace_env_vars(config)
+    _replace_env_vars(config)
     
     # Override with env vars if present
     if "SERVER_PORT" in os.environ:
         config["server"]["port"] = int(os.getenv("SERVER_PORT"))
     
-    return config
\ No newline at end of file
+    return config
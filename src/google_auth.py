@@ -10,25 +10,80 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+USER_AGENTS = (
+    # Chrome on Windows 11
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    # Chrome on macOS
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    # Chrome on Linux
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+NEXT_BUTTON_TRANSLATIONS = (
+    "Next",        # English
+    "Suivant",     # French
+    "Próximo",     # Portuguese
+    "Siguiente",   # Spanish
+    "Weiter",      # German
+    "Dalej",       # Polish
+    "다음",        # Korean
+    "次へ",        # Japanese
+    "下一步",      # Chinese Simplified
+    "Далее",       # Russian
+    "Volgende",    # Dutch
+    "Nästa",       # Swedish
+    "Avanti",      # Italian
+    "İleri",       # Turkish
+    "Tiếp theo",   # Vietnamese
+    "ถัดไป",       # Thai
+    "التالي",      # Arabic
+    "הבא",        # Hebrew
+    "Berikutnya"   # Indonesian
+)
+
+CONTINUE_BUTTON_TRANSLATIONS = (
+    "Continue",    # English
+    "Continuer",   # French
+    "Continuar",   # Spanish/Portuguese
+    "Weiter",      # German
+    "Dalej",       # Polish
+    "계속",        # Korean
+    "続行",        # Japanese
+    "继续",        # Chinese Simplified
+    "Продолжить",  # Russian
+    "Doorgaan",    # Dutch
+    "Fortsätt",    # Swedish
+    "Continua",    # Italian
+    "Devam",       # Turkish
+    "Tiếp tục",    # Vietnamese
+    "ดำเนินการต่อ",  # Thai
+    "متابعة",      # Arabic
+    "המשך",        # Hebrew
+    "Lanjutkan"    # Indonesian
+)
+
+# Selectors are static, so they are built once at import time
+_NEXT_BUTTON_SELECTOR = ', '.join(
+    [f'button:has-text("{text}")' for text in NEXT_BUTTON_TRANSLATIONS]
+    + ['button[jsname="LgbsSe"]']
+)
+_CONTINUE_BUTTON_SELECTOR = ', '.join(
+    [f'button:has-text("{text}")' for text in CONTINUE_BUTTON_TRANSLATIONS]
+    + ['div[role="button"][jsname="LgbsSe"]']
+)
+
 class GoogleAuth:
     def __init__(self, service_name: str):
         self.service_name = service_name
         self.session_file = f'google_auth_{service_name.lower()}.json'
         self.screenshot_dir = 'error_screenshots'
+        self._auth_state: Optional[Dict] = None
         os.makedirs(self.screenshot_dir, exist_ok=True)
 
     @staticmethod
     def get_random_user_agent():
         """Return a random modern browser user agent."""
-        user_agents = [
-            # Chrome on Windows 11
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            # Chrome on macOS
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            # Chrome on Linux
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        ]
-        return choice(user_agents)
+        return choice(USER_AGENTS)
 
     @staticmethod
     def get_browser_launch_options():
@@ -54,71 +109,25 @@ class GoogleAuth:
     @staticmethod
     def get_next_button_selector():
         """Return a selector that works for 'Next' button in multiple languages."""
-        next_button_translations = [
-            "Next",        # English
-            "Suivant",     # French
-            "Próximo",     # Portuguese
-            "Siguiente",   # Spanish
-            "Weiter",      # German
-            "Dalej",       # Polish
-            "다음",        # Korean
-            "次へ",        # Japanese
-            "下一步",      # Chinese Simplified
-            "Далее",       # Russian
-            "Volgende",    # Dutch
-            "Nästa",       # Swedish
-            "Avanti",      # Italian
-            "İleri",       # Turkish
-            "Tiếp theo",   # Vietnamese
-            "ถัดไป",       # Thai
-            "التالي",      # Arabic
-            "הבא",        # Hebrew
-            "Berikutnya"   # Indonesian
-        ]
-        
-        text_selectors = [f'button:has-text("{text}")' for text in next_button_translations]
-        text_selectors.append('button[jsname="LgbsSe"]')
-        return ', '.join(text_selectors)
+        return _NEXT_BUTTON_SELECTOR
 
     @staticmethod
     def get_continue_button_selector():
         """Return a selector that works for 'Continue' button in multiple languages."""
-        continue_button_translations = [
-            "Continue",    # English
-            "Continuer",   # French
-            "Continuar",   # Spanish/Portuguese
-            "Weiter",      # German
-            "Dalej",       # Polish
-            "계속",        # Korean
-            "続行",        # Japanese
-            "继续",        # Chinese Simplified
-            "Продолжить",  # Russian
-            "Doorgaan",    # Dutch
-            "Fortsätt",    # Swedish
-            "Continua",    # Italian
-            "Devam",       # Turkish
-            "Tiếp tục",    # Vietnamese
-            "ดำเนินการต่อ",  # Thai
-            "متابعة",      # Arabic
-            "המשך",        # Hebrew
-            "Lanjutkan"    # Indonesian
-        ]
-        
-        text_selectors = [f'button:has-text("{text}")' for text in continue_button_translations]
-        text_selectors.append('div[role="button"][jsname="LgbsSe"]')
-        return ', '.join(text_selectors)
+        return _CONTINUE_BUTTON_SELECTOR
 
     def save_authentication_state(self, storage_state: Dict):
         """Save the authentication state to a file."""
         with open(self.session_file, 'w') as f:
             json.dump(storage_state, f)
+        self._auth_state = storage_state
 
     def load_authentication_state(self):
-        """Load the authentication state from a file."""
-        if os.path.exists(self.session_file):
+        """Load the authentication state from a file, reading it only once."""
+        if self._auth_state is None and os.path.exists(self.session_file):
             with open(self.session_file, 'r') as f:
-                return json.load(f)
-        return None
+                self._auth_state = json.load(f)
+        return self._auth_state
 
     def is_session_valid(self) -> bool:
         """Check if the session file exists and is not empty/corrupted."""
@@ -133,11 +142,9 @@ class GoogleAuth:
         return True
 
     async def type_with_delay(self, page: Page, selector: str, text: str, min_delay: float = 0.1, max_delay: float = 0.3):
-        """Type text with random delays between keystrokes."""
+        """Type text with a randomized delay between keystrokes, in a single Playwright call."""
         await page.fill(selector, "")
-        for character in text:
-            await page.type(selector, character)
-            await asyncio.sleep(uniform(min_delay, max_delay))
+        await page.type(selector, text, delay=int(uniform(min_delay, max_delay) * 1000))
 
     async def login(self, email: str, password: str, headless: bool = False):
         """Login to Google and save the authentication state."""
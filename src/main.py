@@ -1,84 +1,109 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from sse_starlette.sse import EventSourceResponse
+from starlette.background import BackgroundTask
 import uvicorn
 import logging
+import sys
 import time
 import json
-from typing import AsyncGenerator
+import itertools
+from typing import AsyncGenerator, Any
+
+try:
+    import orjson
+    
+    def json_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def json_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode()
 
 from config import load_config
-from models import ChatCompletionRequest, CLAUDE_MODELS, CHATGPT_MODELS
+from models import ChatCompletionRequest, ALL_MODELS, SUPPORTED_MODELS_ERROR
 from bridge import LLMWebBridge
-from cache import ConversationCache
+from cache import ConversationCache, ResponseCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Per-process sequence for completion ids
+_id_counter = itertools.count()
+
 # Load configuration
 config = load_config()
 
 # Initialize cache and bridge
+hash_algorithm = config['cache'].get('hash_algorithm', 'blake2b')
 cache = ConversationCache(
     config['cache']['db_path'],
     config['cache']['cleanup_interval'],
-    config['cache']['max_age']
+    config['cache']['max_age'],
+    hash_algorithm=hash_algorithm
 )
-bridge = LLMWebBridge(config, cache)
+response_cache_config = config['cache'].get('response_cache', {})
+response_cache = None
+if response_cache_config.get('enabled', False):
+    response_cache = ResponseCache(
+        config['cache']['db_path'],
+        config['cache']['cleanup_interval'],
+        config['cache']['max_age'],
+        semantic=response_cache_config.get('semantic', False),
+        similarity_threshold=response_cache_config.get('similarity_threshold', 0.92),
+        hash_algorithm=hash_algorithm
+    )
+bridge = LLMWebBridge(config, cache, response_cache)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     try:
+        await cache.connect()
+        if response_cache:
+            await response_cache.connect()
         await bridge.initialize()
         await cache.start_cleanup()
+        if response_cache:
+            await response_cache.start_cleanup()
         yield
     finally:
         # Shutdown
         if bridge.browser:
             await bridge.browser.close()
+        await cache.close()
+        if response_cache:
+            await response_cache.close()
 
 # Initialize FastAPI app
 app = FastAPI(title="LLM Web Bridge API", lifespan=lifespan)
 
+def _approx_tokens(text: str) -> int:
+    """Rough token count: one per space-separated word, without splitting the text."""
+    return text.count(' ') + 1 if text else 0
+
 async def generate_streaming_response(model: str, message: str, is_new_chat: bool,
-                                   chat_url: str, full_messages=None) -> AsyncGenerator[str, None]:
+                                   chat_url: str, full_messages=None) -> AsyncGenerator[bytes, None]:
     """Generate streaming response in SSE format."""
     response_id = f"web-bridge-{int(time.time())}"
     created = int(time.time())
     
+    # The envelope is identical for every chunk; only the delta content is encoded per chunk
+    # Bytes are written to the socket as-is by EventSourceResponse
+    envelope = (
+        f'{{"id":"{response_id}","object":"chat.completion.chunk",'
+        f'"created":{created},"model":'.encode() + json_bytes(model) + b',"choices":[{'
+    )
+    chunk_prefix = b'data: ' + envelope + b'"delta":{"content":'
+    chunk_suffix = b'},"index":0,"finish_reason":null}]}\n\n'
+    
     try:
         async for chunk in bridge.stream_response(message, is_new_chat, chat_url, full_messages):
-            response_data = {
-                "id": response_id,
-                "object": "chat.completion.chunk",
-                "created": created,
-                "model": model,
-                "choices": [{
-                    "delta": {
-                        "content": chunk
-                    },
-                    "index": 0,
-                    "finish_reason": None
-                }]
-            }
-            yield f"data: {json.dumps(response_data)}\n\n"
+            yield chunk_prefix + json_bytes(chunk) + chunk_suffix
         
         # Send the final chunk
-        final_data = {
-            "id": response_id,
-            "object": "chat.completion.chunk",
-            "created": created,
-            "model": model,
-            "choices": [{
-                "delta": {},
-                "index": 0,
-                "finish_reason": "stop"
-            }]
-        }
-        yield f"data: {json.dumps(final_data)}\n\n"
-        yield "data: [DONE]\n\n"
+        yield b'data: ' + envelope + b'"delta":{},"index":0,"finish_reason":"stop"}]}\n\n'
+        yield b"data: [DONE]\n\n"
         
     except Exception as e:
         logger.error(f"Error in stream generation: {str(e)}")
@@ -89,16 +114,15 @@ async def create_chat_completion(request: ChatCompletionRequest):
     """Handle chat completion requests."""
     try:
         # Validate model
-        if request.model not in CLAUDE_MODELS and request.model not in CHATGPT_MODELS:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unsupported model. Please use one of: {list(CLAUDE_MODELS.keys()) + list(CHATGPT_MODELS.keys())}"
-            )
+        if request.model not in ALL_MODELS:
+            raise HTTPException(status_code=400, detail=SUPPORTED_MODELS_ERROR)
+        
+        messages = [msg.model_dump() for msg in request.messages]
         
         # Process request and get chat URL
         chat_url, is_new_chat = await bridge.process_completion_request(
             request.model,
-            [msg.dict() for msg in request.messages]
+            messages
         )
         
         # Get the last message
@@ -112,8 +136,10 @@ async def create_chat_completion(request: ChatCompletionRequest):
                     last_message.content,
                     is_new_chat,
                     chat_url,
-                    [msg.dict() for msg in request.messages] if is_new_chat else None
-                )
+                    messages if is_new_chat else None
+                ),
+                # The generator may never start if the client disconnects first
+                background=BackgroundTask(bridge.release_request, chat_url)
             )
         
         # Handle non-streaming response
@@ -121,14 +147,17 @@ async def create_chat_completion(request: ChatCompletionRequest):
             last_message.content,
             is_new_chat,
             chat_url,
-            [msg.dict() for msg in request.messages] if is_new_chat else None
+            messages if is_new_chat else None
         )
         
         # Format response
+        created = int(time.time())
+        prompt_tokens = _approx_tokens(last_message.content)
+        completion_tokens = _approx_tokens(response_text)
         response = {
-            "id": "web-bridge-" + str(hash(response_text)),
+            "id": f"web-bridge-{created}-{next(_id_counter)}",
             "object": "chat.completion",
-            "created": int(time.time()),
+            "created": created,
             "model": request.model,
             "choices": [{
                 "index": 0,
@@ -139,9 +168,9 @@ async def create_chat_completion(request: ChatCompletionRequest):
                 "finish_reason": "stop"
             }],
             "usage": {
-                "prompt_tokens": len(last_message.content.split()),
-                "completion_tokens": len(response_text.split()),
-                "total_tokens": len(last_message.content.split()) + len(response_text.split())
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
             }
         }
         
@@ -155,5 +184,11 @@ if __name__ == "__main__":
     uvicorn.run(
         app,
         host=config["server"]["host"],
-        port=config["server"]["port"]
+        port=config["server"]["port"],
+        # uvloop has no Windows support
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        # Keep idle SSE clients' connections open between requests
+        timeout_keep_alive=75,
+        log_level="info"
     )
\ No newline at end of file
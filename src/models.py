@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, NamedTuple
 from enum import Enum
 
 class AuthMethod(str, Enum):
@@ -29,29 +29,41 @@ class ChatCompletionResponse(BaseModel):
     choices: List[Dict[str, Any]]
     usage: Dict[str, int]
 
+class ModelInfo(NamedTuple):
+    selector: str
+    display_name: str
+    provider: ModelProvider
+
 # Model configurations
-CLAUDE_MODELS = {
-    f"{ModelProvider.ANTHROPIC}/claude-3-opus": {
-        "selector": "button[aria-label='Claude 3 Opus']",
-        "display_name": "Claude 3 Opus"
-    },
-    f"{ModelProvider.ANTHROPIC}/claude-3.5-sonnet": {
-        "selector": "button[aria-label='Claude 3.5 Sonnet']",
-        "display_name": "Claude 3.5 Sonnet"
-    },
-    f"{ModelProvider.ANTHROPIC}/claude-3-haiku": {
-        "selector": "button[aria-label='Claude 3 Haiku']",
-        "display_name": "Claude 3 Haiku"
-    }
+MODEL_REGISTRY: Dict[str, ModelInfo] = {
+    "aipi/anthropic/claude-3-opus": ModelInfo(
+        "button[aria-label='Claude 3 Opus']", "Claude 3 Opus", ModelProvider.ANTHROPIC
+    ),
+    "aipi/anthropic/claude-3.5-sonnet": ModelInfo(
+        "button[aria-label='Claude 3.5 Sonnet']", "Claude 3.5 Sonnet", ModelProvider.ANTHROPIC
+    ),
+    "aipi/anthropic/claude-3-haiku": ModelInfo(
+        "button[aria-label='Claude 3 Haiku']", "Claude 3 Haiku", ModelProvider.ANTHROPIC
+    ),
+    "aipi/openai/gpt-4": ModelInfo(
+        "button[aria-label='GPT-4']", "GPT-4", ModelProvider.OPENAI
+    ),
+    "aipi/openai/gpt-3.5-turbo": ModelInfo(
+        "button[aria-label='GPT-3.5']", "GPT-3.5", ModelProvider.OPENAI
+    ),
 }
 
+# Per-provider views of the registry
+CLAUDE_MODELS = {
+    model_id: info for model_id, info in MODEL_REGISTRY.items()
+    if info.provider is ModelProvider.ANTHROPIC
+}
 CHATGPT_MODELS = {
-    f"{ModelProvider.OPENAI}/gpt-4": {
-        "selector": "button[aria-label='GPT-4']",
-        "display_name": "GPT-4"
-    },
-    f"{ModelProvider.OPENAI}/gpt-3.5-turbo": {
-        "selector": "button[aria-label='GPT-3.5']",
-        "display_name": "GPT-3.5"
-    }
-}
\ No newline at end of file
+    model_id: info for model_id, info in MODEL_REGISTRY.items()
+    if info.provider is ModelProvider.OPENAI
+}
+
+# Model validation, built once at import
+ALL_MODELS = frozenset(MODEL_REGISTRY)
+SUPPORTED_MODELS_LIST = list(MODEL_REGISTRY)
+SUPPORTED_MODELS_ERROR = f"Unsupported model. Please use one of: {SUPPORTED_MODELS_LIST}"